@@ -1,47 +1,162 @@
+import os
+import re
+from array import array
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Dict
-from uuid import UUID, uuid4
+from time import time
+from typing import Deque, Dict, Iterable, Optional
+from uuid import UUID
+
+
+_is_account_number = re.compile(r"\A[0-9]{10}\Z").match
+_is_phone_number = re.compile(r"\A[0-9]{12}\Z").match
+
+
+_MAX_ACCOUNT_NUMBER = 9_999_999_999
+_MAX_BALANCE_CENTS = 2**63 - 1
+
+_ID_BATCH_SIZE = 256
+_id_pool: list[bytes] = []
+
+
+def _new_id() -> UUID:
+    try:
+        id_bytes = _id_pool.pop()
+    except IndexError:
+        raw = os.urandom(16 * _ID_BATCH_SIZE)
+        id_bytes = raw[:16]
+        _id_pool.extend([raw[i : i + 16] for i in range(16, len(raw), 16)])
+    return UUID(bytes=id_bytes, version=4)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_id_pool.clear)
+
+
+def _to_cents(amount: Decimal) -> int:
+    cents = Decimal(amount).scaleb(2)
+    if not cents.is_finite():
+        raise ValueError("Invalid amount")
+    if cents != cents.to_integral_value():
+        raise ValueError("Amount must have at most 2 decimal places")
+    return int(cents)
+
+
+def _format_cents(cents: int) -> str:
+    sign = "-" if cents < 0 else ""
+    whole, fraction = divmod(abs(cents), 100)
+    return f"{sign}{whole}.{fraction:02d}"
+
+
+def _key(u: UUID) -> int:
+    return u.int
+
+
+def _deposited(balance: int, amount: int) -> int:
+    if amount < 0:
+        raise ValueError("Deposit amount must be greater than 0")
+    balance += amount
+    if balance > _MAX_BALANCE_CENTS:
+        raise ValueError("Balance limit exceeded")
+    return balance
+
+
+def _withdrawn(balance: int, amount: int) -> int:
+    if amount <= 0:
+        raise ValueError("Withdraw amount must be greater than 0")
+    if amount > balance:
+        raise ValueError("Insufficient balance")
+    return balance - amount
 
 
-@dataclass
 class Account:
-    customer_id: UUID
-    account_number: str
-    balance: Decimal = Decimal("0")
-    account_id: UUID = field(default_factory=uuid4)
+    __slots__ = (
+        "customer_id",
+        "account_number",
+        "account_id",
+        "_balance",
+        "_balances",
+        "_row",
+    )
 
-    def __post_init__(self):
-        if not self.account_number.isdigit() or len(self.account_number) != 10:
+    def __init__(
+        self,
+        customer_id: UUID,
+        account_number: str,
+        balance: int = 0,
+        account_id: Optional[UUID] = None,
+    ):
+        if not _is_account_number(account_number):
             raise ValueError("Account number must be 10 digits")
+        if not -_MAX_BALANCE_CENTS <= balance <= _MAX_BALANCE_CENTS:
+            raise ValueError("Balance limit exceeded")
+        self.customer_id = customer_id
+        self.account_number = account_number
+        self.account_id = _new_id() if account_id is None else account_id
+        # Unsaved accounts keep their balance in _balance; saving binds the
+        # account to a row of the repository's balance column.
+        self._balance = balance
+        self._balances: Optional[array] = None
+        self._row = 0
+
+    def __repr__(self):
+        return (
+            f"Account(customer_id={self.customer_id!r}, "
+            f"account_number={self.account_number!r}, "
+            f"balance={self.balance!r}, account_id={self.account_id!r})"
+        )
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self.customer_id,
+            self.account_number,
+            self.balance,
+            self.account_id,
+        ) == (
+            other.customer_id,
+            other.account_number,
+            other.balance,
+            other.account_id,
+        )
+
+    __hash__ = None
+
+    @property
+    def balance(self) -> int:
+        if self._balances is None:
+            return self._balance
+        return self._balances[self._row]
+
+    def _set_balance(self, balance: int):
+        if self._balances is None:
+            self._balance = balance
+        else:
+            self._balances[self._row] = balance
 
-    def deposit(self, amount: Decimal):
-        if amount < 0:
-            raise ValueError("Deposit amount must be greater than 0")
-        self.balance += amount
+    def deposit(self, amount: int):
+        self._set_balance(_deposited(self.balance, amount))
 
-    def withdraw(self, amount: Decimal):
-        if amount <= 0:
-            raise ValueError("Withdraw amount must be greater than 0")
-        if amount > self.balance:
-            raise ValueError("Insufficient balance")
-        self.balance -= amount
+    def withdraw(self, amount: int):
+        self._set_balance(_withdrawn(self.balance, amount))
 
     def get_balance(self) -> str:
-        return str(self.balance)
+        return _format_cents(self.balance)
 
 
-@dataclass
+@dataclass(slots=True)
 class Customer:
     name: str
     email: str
     phone_number: str
-    customer_id: UUID = field(default_factory=uuid4)
+    customer_id: UUID = field(default_factory=_new_id)
 
     def __post_init__(self):
-        if not self.phone_number.isdigit() or len(self.phone_number) != 12:
+        if not _is_phone_number(self.phone_number):
             raise ValueError(
                 "Invalid phone number. Please input phone number starting with '63' PH code"
             )
@@ -55,58 +170,100 @@ class TransactionType(Enum):
     WITHDRAW = "WITHDRAW"
 
 
-@dataclass
+@dataclass(slots=True)
 class TransactionRecord:
     account_id: UUID
-    amount: Decimal
+    amount_cents: int
     type: TransactionType
-    transaction_timestamp: datetime = field(default_factory=datetime.now)
-    transaction_id: UUID = field(default_factory=uuid4)
+    transaction_timestamp: float = field(default_factory=time)
+    transaction_id: UUID = field(default_factory=_new_id)
 
     def __repr__(self):
-        return f"DATE: {self.transaction_timestamp} ------ TYPE: {self.type.value} ------- AMOUNT: P{self.amount:.2f}"
+        return self._fmt()
+
+    def _fmt(self) -> str:
+        return f"DATE: {datetime.fromtimestamp(self.transaction_timestamp)} ------ TYPE: {self.type.value} ------- AMOUNT: P{_format_cents(self.amount_cents)}"
 
 
 class AccountRepository:
     def __init__(self):
-        self.accounts: Dict[UUID, Account] = {}
-        self.customer_accounts: Dict[UUID, list[Account]] = {}
+        self.accounts: Dict[int, Account] = {}
+        self._balances = array("q")
         self.current_account_number = 0
+        self._account_number_buffer = bytearray(b"0000000000")
+        self._buffered_account_number = 0
 
     def save_account(self, account: Account):
-        if account.account_id in self.accounts:
+        account_key = _key(account.account_id)
+        if account_key in self.accounts:
             raise ValueError("Account already exists")
-        self.accounts[account.account_id] = account
-        if account.customer_id not in self.customer_accounts:
-            self.customer_accounts[account.customer_id] = []
-        self.customer_accounts[account.customer_id].append(account)
+        row = len(self._balances)
+        self._balances.append(account.balance)
+        account._balances = self._balances
+        account._row = row
+        self.accounts[account_key] = account
 
     def generate_account_number(self) -> str:
+        if self.current_account_number >= _MAX_ACCOUNT_NUMBER:
+            raise ValueError("Account numbers exhausted")
+        buffer = self._account_number_buffer
+        if self._buffered_account_number != self.current_account_number:
+            buffer[:] = b"%010d" % self.current_account_number
         self.current_account_number += 1
-        account_number = f"{self.current_account_number:010d}"
-        return account_number
+        self._buffered_account_number = self.current_account_number
+        index = 9
+        while buffer[index] == 57:  # ord("9")
+            buffer[index] = 48  # ord("0")
+            index -= 1
+        buffer[index] += 1
+        return buffer.decode("ascii")
+
+    def total_balance(self) -> int:
+        return sum(self._balances)
+
+    def find_row_by_id(self, account_id: UUID) -> int:
+        return self.find_account_by_id(account_id)._row
+
+    def get_row_balance(self, row: int) -> int:
+        return self._balances[row]
+
+    def set_row_balances(self, row_balances: Dict[int, int]):
+        balances = self._balances
+        for row, balance in row_balances.items():
+            balances[row] = balance
 
     def find_account_by_id(self, account_id: UUID) -> Account:
-        return self.accounts[account_id]
+        # Inlined _key(): this lookup sits on every transaction.
+        return self.accounts[account_id.int]
 
     def find_accounts_by_customer_id(self, customer_id: UUID) -> list[Account]:
-        return self.customer_accounts.get(customer_id, [])
+        customer_key = _key(customer_id)
+        return [
+            account
+            for account in self.accounts.values()
+            if account.customer_id.int == customer_key
+        ]
 
 
 class TransactionRepository:
     def __init__(self):
-        self.transactions: Dict[UUID, list[TransactionRecord]] = {}
+        self.transactions: Dict[int, Deque[TransactionRecord]] = {}
 
-    def get_transactions(self, account_id: UUID) -> list[TransactionRecord]:
-        if account_id not in self.transactions:
+    def get_transactions(self, account_id: UUID) -> Deque[TransactionRecord]:
+        account_key = _key(account_id)
+        if account_key not in self.transactions:
             raise ValueError("Account has not made transactions")
-        return self.transactions[account_id]
+        return self.transactions[account_key]
 
     def store_transaction(self, transaction_record: TransactionRecord):
-        account_id = transaction_record.account_id
-        if account_id not in self.transactions:
-            self.transactions[account_id] = []
-        self.transactions[account_id].append(transaction_record)
+        account_key = _key(transaction_record.account_id)
+        try:
+            self.transactions[account_key].append(transaction_record)
+        except KeyError:
+            # setdefault keeps the first deque if another thread created it.
+            self.transactions.setdefault(account_key, deque()).append(
+                transaction_record
+            )
 
 
 class AccountService:
@@ -127,6 +284,15 @@ class AccountService:
 
 
 class TransactionService:
+    _DISPATCH = {
+        TransactionType.DEPOSIT: Account.deposit,
+        TransactionType.WITHDRAW: Account.withdraw,
+    }
+    _BALANCE_RULES = {
+        TransactionType.DEPOSIT: _deposited,
+        TransactionType.WITHDRAW: _withdrawn,
+    }
+
     def __init__(
         self,
         account_repository: AccountRepository,
@@ -137,22 +303,24 @@ class TransactionService:
 
     @staticmethod
     def _create_transaction_record(
-        account_id: UUID, amount: Decimal, type: TransactionType
+        account_id: UUID, amount_cents: int, type: TransactionType
     ) -> TransactionRecord:
-        return TransactionRecord(account_id, amount, type)
+        return TransactionRecord(account_id, amount_cents, type)
 
     def _process_transaction(
         self, account_id, amount: Decimal, transaction_type: TransactionType
     ) -> TransactionRecord:
-        if amount < 0:
-            raise ValueError("Amount should be positive value")
+        try:
+            apply_transaction = self._DISPATCH[transaction_type]
+        except KeyError:
+            raise ValueError("Unsupported transaction type") from None
+        amount_cents = _to_cents(amount)
         account: Account = self.account_repository.find_account_by_id(account_id)
-        if transaction_type == TransactionType.DEPOSIT:
-            account.deposit(amount)
-        if transaction_type == TransactionType.WITHDRAW:
-            account.withdraw(amount)
+        apply_transaction(account, amount_cents)
 
-        return self._create_transaction_record(account_id, amount, transaction_type)
+        return self._create_transaction_record(
+            account_id, amount_cents, transaction_type
+        )
 
     def make_transaction(
         self, account_id: UUID, amount: Decimal, transaction_type: TransactionType
@@ -162,6 +330,50 @@ class TransactionService:
         )
         self.transaction_repository.store_transaction(transaction_record)
 
+    def make_transactions_bulk(
+        self,
+        account_ids: Iterable[UUID],
+        amounts: Iterable[Decimal],
+        transaction_types: Iterable[TransactionType],
+    ):
+        # Balances are read up front and written back once the whole batch is
+        # validated. Do not run this alongside make_transaction on the same
+        # accounts: updates made in between are overwritten.
+        account_repository = self.account_repository
+        find_row_by_id = account_repository.find_row_by_id
+        get_row_balance = account_repository.get_row_balance
+        rules = self._BALANCE_RULES
+        rows: Dict[int, int] = {}
+        pending_balances: Dict[int, int] = {}
+        get_pending = pending_balances.get
+        accepted = []
+        accept = accepted.append
+        for account_id, amount, transaction_type in zip(
+            account_ids, amounts, transaction_types, strict=True
+        ):
+            try:
+                apply_rule = rules[transaction_type]
+            except KeyError:
+                raise ValueError("Unsupported transaction type") from None
+            amount_cents = _to_cents(amount)
+            account_key = account_id.int
+            row = rows.get(account_key)
+            if row is None:
+                row = rows[account_key] = find_row_by_id(account_id)
+            balance = get_pending(row)
+            if balance is None:
+                balance = get_row_balance(row)
+            pending_balances[row] = apply_rule(balance, amount_cents)
+            accept((account_id, amount_cents, transaction_type))
+
+        account_repository.set_row_balances(pending_balances)
+        for account_id, amount_cents, transaction_type in accepted:
+            self.transaction_repository.store_transaction(
+                self._create_transaction_record(
+                    account_id, amount_cents, transaction_type
+                )
+            )
+
 
 class AccountStatement:
     def __init__(self, transaction_repository: TransactionRepository):
@@ -170,7 +382,7 @@ class AccountStatement:
     def generate_account_statement(self, account_id: UUID) -> str:
         transactions = self.transaction_repository.get_transactions(account_id)
 
-        return "\n".join(str(transaction) for transaction in transactions)
+        return "\n".join([transaction._fmt() for transaction in transactions])
 
 
 def main():
@@ -247,6 +459,29 @@ def main():
     print(f"Account statement for account number {new_account.account_number}")
     print(transactions)
 
+    # scenario for bulk transactions
+    second_account = account_service.create_account(new_customer2)
+    transaction_service.make_transactions_bulk(
+        [second_account.account_id, second_account.account_id],
+        [Decimal("1000.00"), Decimal("150.50")],
+        [TransactionType.DEPOSIT, TransactionType.WITHDRAW],
+    )
+    print(f"Bulk transactions successful. New balance: {second_account.get_balance()}")
+
+    # scenario for rejected bulk transactions
+    try:
+        transaction_service.make_transactions_bulk(
+            [new_account.account_id, second_account.account_id],
+            [Decimal("100.00"), Decimal("5000.00")],
+            [TransactionType.DEPOSIT, TransactionType.WITHDRAW],
+        )
+    except ValueError as e:
+        print(f"Bulk transaction error: {e}")
+        print(
+            f"Balances unchanged: {new_account.get_balance()}, "
+            f"{second_account.get_balance()}"
+        )
+
 
 if __name__ == "__main__":
     main()